@@ -4,7 +4,8 @@
 # SPDX-License-Identifier: Apache-2.0
 """Bandit is a tool designed to find common security issues in Python code."""
 import argparse
-import fnmatch
+import functools
+import itertools
 import logging
 import os
 import sys
@@ -18,6 +19,33 @@ from bandit.core import utils
 
 BASE_CONFIG = "bandit.yaml"
 LOG = logging.getLogger()
+_WARNINGS_CAPTURED = False
+_EXCLUDE_DEFAULT = ",".join(constants.EXCLUDE)
+
+# argument destinations that may be supplied by a .bandit file, along with
+# the ini file key and a description used when logging the option source
+# TODO(tmcpeak): any other useful options to pass from .bandit?
+_INI_OPTIONS = (
+    ("config_file", "configfile", "config file"),
+    ("excluded_paths", "exclude", "excluded paths"),
+    ("skips", "skips", "skipped tests"),
+    ("tests", "tests", "selected tests"),
+    ("targets", "targets", "selected targets"),
+    ("recursive", "recursive", "recursive scan"),
+    ("agg_type", "aggregate", "aggregate output type"),
+    ("context_lines", "number", "max code lines output for issue"),
+    ("profile", "profile", "profile"),
+    ("severity", "level", "severity level"),
+    ("confidence", "confidence", "confidence level"),
+    ("output_format", "format", "output format"),
+    ("msg_template", "msg-template", "output message template"),
+    ("output_file", "output", "output file"),
+    ("verbose", "verbose", "output extra information"),
+    ("debug", "debug", "debug mode"),
+    ("quiet", "quiet", "silent mode"),
+    ("ignore_nosec", "ignore-nosec", "do not skip lines with # nosec"),
+    ("baseline", "baseline", "path of a baseline report"),
+)
 
 
 def _init_logger(log_level=logging.INFO, log_format=None):
@@ -26,6 +54,7 @@ def _init_logger(log_level=logging.INFO, log_format=None):
     :param debug: Whether to enable debug mode
     :return: An instantiated logging instance
     """
+    global _WARNINGS_CAPTURED
     LOG.handlers = []
 
     if not log_format:
@@ -34,7 +63,10 @@ def _init_logger(log_level=logging.INFO, log_format=None):
     else:
         log_format_string = log_format
 
-    logging.captureWarnings(True)
+    # only route warnings through logging once per process
+    if not _WARNINGS_CAPTURED:
+        logging.captureWarnings(True)
+        _WARNINGS_CAPTURED = True
 
     LOG.setLevel(log_level)
     handler = logging.StreamHandler(sys.stderr)
@@ -43,6 +75,24 @@ def _init_logger(log_level=logging.INFO, log_format=None):
     LOG.debug("logging initialized")
 
 
+def _find_bandit_files(target):
+    """Yield the path of every .bandit file found beneath a target."""
+    stack = [target]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            # not a directory or not readable, same as os.walk would skip
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name == ".bandit" and not entry.is_dir():
+                # os.walk listed symlinks to directories as directories
+                yield entry.path
+
+
 def _get_options_from_ini(ini_path, target):
     """Return a dictionary of config options or None if we can't load any."""
     ini_file = None
@@ -50,12 +100,16 @@ def _get_options_from_ini(ini_path, target):
     if ini_path:
         ini_file = ini_path
     else:
-        bandit_files = []
-
-        for t in target:
-            for root, _, filenames in os.walk(t):
-                for filename in fnmatch.filter(filenames, ".bandit"):
-                    bandit_files.append(os.path.join(root, filename))
+        # more than one is an error, so stop looking across all targets
+        # as soon as a second file turns up
+        bandit_files = list(
+            itertools.islice(
+                itertools.chain.from_iterable(
+                    _find_bandit_files(t) for t in target
+                ),
+                2,
+            )
+        )
 
         if len(bandit_files) > 1:
             LOG.error(
@@ -81,79 +135,74 @@ def _init_extensions():
     return ext_loader.MANAGER
 
 
-def _log_option_source(default_val, arg_val, ini_val, option_name):
-    """It's useful to show the source of each option."""
-    # When default value is not defined, arg_val and ini_val is deterministic
-    if default_val is None:
-        if arg_val:
-            LOG.info("Using command line arg for %s", option_name)
-            return arg_val
-        elif ini_val:
-            LOG.info("Using ini file for %s", option_name)
-            return ini_val
-        else:
-            return None
-    # No value passed to commad line and default value is used
-    elif default_val == arg_val:
-        return ini_val if ini_val else arg_val
-    # Certainly a value is passed to commad line
-    else:
-        return arg_val
+class _LazyEpilogParser(argparse.ArgumentParser):
+    """Argument parser which only builds its epilog when help is shown."""
 
+    def __init__(self, *args, epilog_func=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._epilog_func = epilog_func
 
-def _running_under_virtualenv():
-    if hasattr(sys, "real_prefix"):
-        return True
-    elif sys.prefix != getattr(sys, "base_prefix", sys.prefix):
-        return True
+    def format_help(self):
+        if self.epilog is None and self._epilog_func is not None:
+            self.epilog = self._epilog_func()
+        return super().format_help()
 
 
-def _get_profile(config, profile_name, config_path):
-    profile = {}
-    if profile_name:
-        profiles = config.get_option("profiles") or {}
-        profile = profiles.get(profile_name)
-        if profile is None:
-            raise utils.ProfileNotFound(config_path, profile_name)
-        LOG.debug("read in legacy profile '%s': %s", profile_name, profile)
-    else:
-        profile["include"] = set(config.get_option("tests") or [])
-        profile["exclude"] = set(config.get_option("skips") or [])
-    return profile
+def _get_epilog(extension_mgr):
+    """Return the help epilog listing custom formatting and loaded tests."""
+    plugin_info = {
+        f"{pid}\t{p.name}" for pid, p in extension_mgr.plugins_by_id.items()
+    }
+    plugin_info.update(
+        f"{b['id']}\t{b['name']}"
+        for checks in extension_mgr.blacklist.values()
+        for b in checks
+    )
 
+    plugin_list = "\n\t".join(sorted(plugin_info))
+    dedent_text = textwrap.dedent(
+        """
+    CUSTOM FORMATTING
+    -----------------
 
-def _log_info(args, profile):
-    inc = ",".join([t for t in profile["include"]]) or "None"
-    exc = ",".join([t for t in profile["exclude"]]) or "None"
-    LOG.info("profile include tests: %s", inc)
-    LOG.info("profile exclude tests: %s", exc)
-    LOG.info("cli include tests: %s", args.tests)
-    LOG.info("cli exclude tests: %s", args.skips)
+    Available tags:
+
+        {abspath}, {relpath}, {line}, {col}, {test_id},
+        {severity}, {msg}, {confidence}, {range}
 
+    Example usage:
 
-def main():
-    """Bandit CLI."""
-    # bring our logging stuff up as early as possible
-    debug = (
-        logging.DEBUG
-        if "-d" in sys.argv or "--debug" in sys.argv
-        else logging.INFO
+        Default template:
+        bandit -r examples/ --format custom --msg-template \\
+        "{abspath}:{line}: {test_id}[bandit]: {severity}: {msg}"
+
+        Provides same output as:
+        bandit -r examples/ --format custom
+
+        Tags can also be formatted in python string.format() style:
+        bandit -r examples/ --format custom --msg-template \\
+        "{relpath:20.20s}: {line:03}: {test_id:^8}: DEFECT: {msg:>20}"
+
+        See python documentation for more information about formatting style:
+        https://docs.python.org/3/library/string.html
+
+    The following tests were discovered and loaded:
+    -----------------------------------------------
+    """
     )
-    _init_logger(debug)
-    extension_mgr = _init_extensions()
+    return dedent_text + f"\t{plugin_list}"
 
-    baseline_formatters = [
-        f.name
-        for f in filter(
-            lambda x: hasattr(x.plugin, "_accepts_baseline"),
-            extension_mgr.formatters,
-        )
-    ]
 
-    # now do normal startup
-    parser = argparse.ArgumentParser(
+@functools.lru_cache(maxsize=1)
+def _build_parser(extension_mgr):
+    """Build the argument parser, reused when main() runs again in-process.
+
+    The output format and output file defaults are left to the caller.
+    """
+    parser = _LazyEpilogParser(
         description="Bandit - a Python source code security analyzer",
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog_func=lambda: _get_epilog(extension_mgr),
     )
     parser.add_argument(
         "targets",
@@ -265,21 +314,11 @@ def main():
         ' not be listed in "low".',
         choices=["all", "low", "medium", "high"],
     )
-    output_format = (
-        "screen"
-        if (
-            sys.stdout.isatty()
-            and os.getenv("NO_COLOR") is None
-            and os.getenv("TERM") != "dumb"
-        )
-        else "txt"
-    )
     parser.add_argument(
         "-f",
         "--format",
         dest="output_format",
         action="store",
-        default=output_format,
         help="specify output format",
         choices=sorted(extension_mgr.formatter_names),
     )
@@ -299,7 +338,6 @@ def main():
         action="store",
         nargs="?",
         type=argparse.FileType("w", encoding="utf-8"),
-        default=sys.stdout,
         help="write report to filename",
     )
     group = parser.add_mutually_exclusive_group(required=False)
@@ -336,13 +374,11 @@ def main():
         "--exclude",
         dest="excluded_paths",
         action="store",
-        default=",".join(constants.EXCLUDE),
+        default=_EXCLUDE_DEFAULT,
         help="comma-separated list of paths (glob patterns "
         "supported) to exclude from scan "
         "(note that these are in addition to the excluded "
-        "paths provided in the config file) (default: "
-        + ",".join(constants.EXCLUDE)
-        + ")",
+        f"paths provided in the config file) (default: {_EXCLUDE_DEFAULT})",
     )
     parser.add_argument(
         "-b",
@@ -380,46 +416,83 @@ def main():
     parser.set_defaults(quiet=False)
     parser.set_defaults(ignore_nosec=False)
 
-    plugin_info = [
-        f"{a[0]}\t{a[1].name}" for a in extension_mgr.plugins_by_id.items()
-    ]
-    blacklist_info = []
-    for a in extension_mgr.blacklist.items():
-        for b in a[1]:
-            blacklist_info.append(f"{b['id']}\t{b['name']}")
+    return parser
 
-    plugin_list = "\n\t".join(sorted(set(plugin_info + blacklist_info)))
-    dedent_text = textwrap.dedent(
-        """
-    CUSTOM FORMATTING
-    -----------------
 
-    Available tags:
+def _log_option_source(default_val, arg_val, ini_val, option_name):
+    """It's useful to show the source of each option."""
+    # When default value is not defined, arg_val and ini_val is deterministic
+    if default_val is None:
+        if arg_val:
+            LOG.info("Using command line arg for %s", option_name)
+            return arg_val
+        elif ini_val:
+            LOG.info("Using ini file for %s", option_name)
+            return ini_val
+        else:
+            return None
+    # No value passed to commad line and default value is used
+    elif default_val == arg_val:
+        return ini_val if ini_val else arg_val
+    # Certainly a value is passed to commad line
+    else:
+        return arg_val
 
-        {abspath}, {relpath}, {line}, {col}, {test_id},
-        {severity}, {msg}, {confidence}, {range}
 
-    Example usage:
+def _running_under_virtualenv():
+    if hasattr(sys, "real_prefix"):
+        return True
+    elif sys.prefix != getattr(sys, "base_prefix", sys.prefix):
+        return True
 
-        Default template:
-        bandit -r examples/ --format custom --msg-template \\
-        "{abspath}:{line}: {test_id}[bandit]: {severity}: {msg}"
 
-        Provides same output as:
-        bandit -r examples/ --format custom
+def _get_profile(config, profile_name, config_path):
+    profile = {}
+    if profile_name:
+        profiles = config.get_option("profiles") or {}
+        profile = profiles.get(profile_name)
+        if profile is None:
+            raise utils.ProfileNotFound(config_path, profile_name)
+        LOG.debug("read in legacy profile '%s': %s", profile_name, profile)
+    else:
+        profile["include"] = set(config.get_option("tests") or [])
+        profile["exclude"] = set(config.get_option("skips") or [])
+    return profile
 
-        Tags can also be formatted in python string.format() style:
-        bandit -r examples/ --format custom --msg-template \\
-        "{relpath:20.20s}: {line:03}: {test_id:^8}: DEFECT: {msg:>20}"
 
-        See python documentation for more information about formatting style:
-        https://docs.python.org/3/library/string.html
+def _log_info(args, profile):
+    inc = ",".join([t for t in profile["include"]]) or "None"
+    exc = ",".join([t for t in profile["exclude"]]) or "None"
+    LOG.info("profile include tests: %s", inc)
+    LOG.info("profile exclude tests: %s", exc)
+    LOG.info("cli include tests: %s", ",".join(args.tests) or "None")
+    LOG.info("cli exclude tests: %s", ",".join(args.skips) or "None")
 
-    The following tests were discovered and loaded:
-    -----------------------------------------------
-    """
+
+def main():
+    """Bandit CLI."""
+    # bring our logging stuff up as early as possible
+    debug = (
+        logging.DEBUG
+        if "-d" in sys.argv or "--debug" in sys.argv
+        else logging.INFO
     )
-    parser.epilog = dedent_text + f"\t{plugin_list}"
+    _init_logger(debug)
+    extension_mgr = _init_extensions()
+
+    # now do normal startup, the defaults which depend on the current
+    # stdout and environment are set here as the parser is cached
+    parser = _build_parser(extension_mgr)
+    output_format = (
+        "screen"
+        if (
+            sys.stdout.isatty()
+            and os.getenv("NO_COLOR") is None
+            and os.getenv("TERM") != "dumb"
+        )
+        else "txt"
+    )
+    parser.set_defaults(output_format=output_format, output_file=sys.stdout)
 
     # setup work - parse arguments, and initialize BanditManager
     args = parser.parse_args()
@@ -453,145 +526,29 @@ def main():
     # Handle .bandit files in projects to pass cmdline args from file
     ini_options = _get_options_from_ini(args.ini_path, args.targets)
     if ini_options:
-        # prefer command line, then ini file
-        args.config_file = _log_option_source(
-            parser.get_default("configfile"),
-            args.config_file,
-            ini_options.get("configfile"),
-            "config file",
-        )
-
-        args.excluded_paths = _log_option_source(
-            parser.get_default("excluded_paths"),
-            args.excluded_paths,
-            ini_options.get("exclude"),
-            "excluded paths",
-        )
-
-        args.skips = _log_option_source(
-            parser.get_default("skips"),
-            args.skips,
-            ini_options.get("skips"),
-            "skipped tests",
-        )
-
-        args.tests = _log_option_source(
-            parser.get_default("tests"),
-            args.tests,
-            ini_options.get("tests"),
-            "selected tests",
-        )
-
         ini_targets = ini_options.get("targets")
-        if ini_targets:
-            ini_targets = ini_targets.split(",")
-
-        args.targets = _log_option_source(
-            parser.get_default("targets"),
-            args.targets,
-            ini_targets,
-            "selected targets",
-        )
-
-        # TODO(tmcpeak): any other useful options to pass from .bandit?
-
-        args.recursive = _log_option_source(
-            parser.get_default("recursive"),
-            args.recursive,
-            ini_options.get("recursive"),
-            "recursive scan",
-        )
-
-        args.agg_type = _log_option_source(
-            parser.get_default("agg_type"),
-            args.agg_type,
-            ini_options.get("aggregate"),
-            "aggregate output type",
-        )
-
-        args.context_lines = _log_option_source(
-            parser.get_default("context_lines"),
-            args.context_lines,
-            int(ini_options.get("number") or 0) or None,
-            "max code lines output for issue",
+        ini_values = dict(
+            ini_options,
+            targets=ini_targets.split(",") if ini_targets else ini_targets,
+            number=int(ini_options.get("number") or 0) or None,
         )
 
-        args.profile = _log_option_source(
-            parser.get_default("profile"),
-            args.profile,
-            ini_options.get("profile"),
-            "profile",
-        )
-
-        args.severity = _log_option_source(
-            parser.get_default("severity"),
-            args.severity,
-            ini_options.get("level"),
-            "severity level",
-        )
-
-        args.confidence = _log_option_source(
-            parser.get_default("confidence"),
-            args.confidence,
-            ini_options.get("confidence"),
-            "confidence level",
-        )
-
-        args.output_format = _log_option_source(
-            parser.get_default("output_format"),
-            args.output_format,
-            ini_options.get("format"),
-            "output format",
-        )
-
-        args.msg_template = _log_option_source(
-            parser.get_default("msg_template"),
-            args.msg_template,
-            ini_options.get("msg-template"),
-            "output message template",
-        )
-
-        args.output_file = _log_option_source(
-            parser.get_default("output_file"),
-            args.output_file,
-            ini_options.get("output"),
-            "output file",
-        )
-
-        args.verbose = _log_option_source(
-            parser.get_default("verbose"),
-            args.verbose,
-            ini_options.get("verbose"),
-            "output extra information",
-        )
-
-        args.debug = _log_option_source(
-            parser.get_default("debug"),
-            args.debug,
-            ini_options.get("debug"),
-            "debug mode",
-        )
-
-        args.quiet = _log_option_source(
-            parser.get_default("quiet"),
-            args.quiet,
-            ini_options.get("quiet"),
-            "silent mode",
-        )
+        # prefer command line, then ini file
+        for dest, ini_key, option_name in _INI_OPTIONS:
+            setattr(
+                args,
+                dest,
+                _log_option_source(
+                    parser.get_default(dest),
+                    getattr(args, dest),
+                    ini_values.get(ini_key),
+                    option_name,
+                ),
+            )
 
-        args.ignore_nosec = _log_option_source(
-            parser.get_default("ignore_nosec"),
-            args.ignore_nosec,
-            ini_options.get("ignore-nosec"),
-            "do not skip lines with # nosec",
-        )
-
-        args.baseline = _log_option_source(
-            parser.get_default("baseline"),
-            args.baseline,
-            ini_options.get("baseline"),
-            "path of a baseline report",
-        )
+    # split the comma-separated test IDs once, now that they are final
+    args.tests = tuple(args.tests.split(",")) if args.tests else ()
+    args.skips = tuple(args.skips.split(",")) if args.skips else ()
 
     try:
         b_conf = b_config.BanditConfig(config_file=args.config_file)
@@ -603,20 +560,24 @@ def main():
         parser.print_usage()
         sys.exit(2)
 
-    # if the log format string was set in the options, reinitialize
-    if b_conf.get_option("log_format"):
-        log_format = b_conf.get_option("log_format")
-        _init_logger(log_level=logging.DEBUG, log_format=log_format)
-
+    # reinitialize the logger at most once, quiet mode takes precedence
+    # over a log format string set in the options
     if args.quiet:
         _init_logger(log_level=logging.WARN)
+    else:
+        log_format = b_conf.get_option("log_format")
+        if log_format:
+            _init_logger(log_level=logging.DEBUG, log_format=log_format)
 
     try:
         profile = _get_profile(b_conf, args.profile, args.config_file)
         _log_info(args, profile)
 
-        profile["include"].update(args.tests.split(",") if args.tests else [])
-        profile["exclude"].update(args.skips.split(",") if args.skips else [])
+        profile["include"].update(args.tests)
+        profile["exclude"].update(args.skips)
+        # the profile is only read from here on
+        profile["include"] = frozenset(profile["include"])
+        profile["exclude"] = frozenset(profile["exclude"])
         extension_mgr.validate_profile(profile)
 
     except (utils.ProfileNotFound, ValueError) as e:
@@ -642,10 +603,15 @@ def main():
             LOG.warning("Could not open baseline report: %s", args.baseline)
             sys.exit(2)
 
+        baseline_formatters = frozenset(
+            f.name
+            for f in extension_mgr.formatters
+            if hasattr(f.plugin, "_accepts_baseline")
+        )
         if args.output_format not in baseline_formatters:
             LOG.warning(
                 "Baseline must be used with one of the following "
-                "formats: " + str(baseline_formatters)
+                "formats: " + str(sorted(baseline_formatters))
             )
             sys.exit(2)
 
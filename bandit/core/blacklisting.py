@@ -6,6 +6,11 @@ import ast
 
 from bandit.core import issue
 
+# calls whose first argument names the module being imported
+_IMPORTLIB_CALLS = frozenset(
+    ("importlib.import_module", "importlib.__import__")
+)
+
 
 def report_issue(check, name):
     return issue.Issue(
@@ -18,6 +23,117 @@ def report_issue(check, name):
     )
 
 
+def _build_trie(checks):
+    """Build a character trie mapping qualname prefixes to check indexes.
+
+    The None key of a node holds the index of the first check which has the
+    qualname ending at that node.
+    """
+    trie = {}
+    for index, check in enumerate(checks):
+        for qn in check["qualnames"]:
+            node = trie
+            for char in qn:
+                node = node.setdefault(char, {})
+            node.setdefault(None, index)
+    return trie
+
+
+def _match_trie(trie, name):
+    """Return the index of the first check with a qualname prefixing name."""
+    found = trie.get(None)
+    node = trie
+    for char in name:
+        node = node.get(char)
+        if node is None:
+            break
+        index = node.get(None)
+        if index is not None and (found is None or index < found):
+            found = index
+    return found
+
+
+def build_lookup_tables(config):
+    """Build the lookup tables for a set of blacklist data.
+
+    Calls are matched on their exact qualified name, so each node type's
+    qualnames are folded into a dict. Imports are matched on a name prefix,
+    so the qualnames are loaded into a trie which finds every matching
+    prefix in a single pass over the imported name.
+    """
+    tables = {}
+    for node_type, checks in config.items():
+        if node_type.startswith("Import"):
+            tables[node_type] = (_build_trie(checks), checks)
+        else:
+            names = {}
+            for check in checks:
+                for qn in check["qualnames"]:
+                    names.setdefault(qn, check)
+            tables[node_type] = names
+    return tables
+
+
+def _get_lookup_tables(config):
+    # the test set builds the tables when it loads the blacklist data, only
+    # data passed in from elsewhere needs them built here
+    if getattr(blacklist, "_config", None) is config:
+        return blacklist._tables
+    return build_lookup_tables(config)
+
+
+def _blacklist_call(context, table):
+    func = context.node.func
+    if isinstance(func, ast.Name) and func.id == "__import__":
+        if len(context.node.args):
+            if isinstance(context.node.args[0], ast.Str):
+                name = context.node.args[0].s
+            else:
+                # TODO(??): import through a variable, need symbol tab
+                name = "UNKNOWN"
+        else:
+            name = ""  # handle '__import__()'
+    else:
+        name = context.call_function_name_qual
+        # In the case the Call is an importlib.import, treat the first
+        # argument name as an actual import module name.
+        # Will produce None if argument is not a literal or identifier
+        if name in _IMPORTLIB_CALLS:
+            if context.call_args_count > 0:
+                name = context.call_args[0]
+            else:
+                name = context.call_keywords["name"]
+    if isinstance(name, str):
+        check = table.get(name)
+        if check is not None:
+            return report_issue(check, name)
+
+
+def _blacklist_import(context, table, prefix=""):
+    trie, checks = table
+    found = None
+    for name in context.node.names:
+        index = _match_trie(trie, prefix + name.name)
+        if index is not None and (found is None or index < found[0]):
+            found = (index, name.name)
+    if found is not None:
+        return report_issue(checks[found[0]], found[1])
+
+
+def _blacklist_import_from(context, table):
+    prefix = ""
+    if context.node.module is not None:
+        prefix = context.node.module + "."
+    return _blacklist_import(context, table, prefix)
+
+
+_HANDLERS = {
+    "Call": _blacklist_call,
+    "Import": _blacklist_import,
+    "ImportFrom": _blacklist_import_from,
+}
+
+
 def blacklist(context, config):
     """Generic blacklist test, B001.
 
@@ -28,43 +144,7 @@ def blacklist(context, config):
     filtering purposes, or alternatively all blacklisting can be filtered using
     the id of this built in test, 'B001'.
     """
-    blacklists = config
     node_type = context.node.__class__.__name__
-
-    if node_type == "Call":
-        func = context.node.func
-        if isinstance(func, ast.Name) and func.id == "__import__":
-            if len(context.node.args):
-                if isinstance(context.node.args[0], ast.Str):
-                    name = context.node.args[0].s
-                else:
-                    # TODO(??): import through a variable, need symbol tab
-                    name = "UNKNOWN"
-            else:
-                name = ""  # handle '__import__()'
-        else:
-            name = context.call_function_name_qual
-            # In the case the Call is an importlib.import, treat the first
-            # argument name as an actual import module name.
-            # Will produce None if argument is not a literal or identifier
-            if name in ["importlib.import_module", "importlib.__import__"]:
-                if context.call_args_count > 0:
-                    name = context.call_args[0]
-                else:
-                    name = context.call_keywords["name"]
-        for check in blacklists[node_type]:
-            for qn in check["qualnames"]:
-                if name is not None and name == qn:
-                    return report_issue(check, name)
-
-    if node_type.startswith("Import"):
-        prefix = ""
-        if node_type == "ImportFrom":
-            if context.node.module is not None:
-                prefix = context.node.module + "."
-
-        for check in blacklists[node_type]:
-            for name in context.node.names:
-                for qn in check["qualnames"]:
-                    if (prefix + name.name).startswith(qn):
-                        return report_issue(check, name.name)
+    handler = _HANDLERS.get(node_type)
+    if handler is not None:
+        return handler(context, _get_lookup_tables(config)[node_type])
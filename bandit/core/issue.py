@@ -76,6 +76,23 @@ class Cwe:
 
 
 class Issue:
+    __slots__ = (
+        "severity",
+        "cwe",
+        "confidence",
+        "text",
+        "ident",
+        "fname",
+        "fdata",
+        "test",
+        "test_id",
+        "lineno",
+        "col_offset",
+        "end_col_offset",
+        "linerange",
+        "code",
+    )
+
     def __init__(
         self,
         severity,
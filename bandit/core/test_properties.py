@@ -64,6 +64,22 @@ def test_id(id_val):
     return _has_id
 
 
+def requires_module(module):
+    """Test function requires a module
+
+    Use of this decorator before a test function indicates that it only
+    applies once a module whose name contains the given name has been
+    imported, so the test can be skipped without being called otherwise.
+    """
+
+    def _requires_module(func):
+        if not hasattr(func, "_requires_module"):
+            func._requires_module = module
+        return func
+
+    return _requires_module
+
+
 def accepts_baseline(*args):
     """Decorator to indicate formatter accepts baseline results
 
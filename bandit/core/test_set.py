@@ -78,9 +78,13 @@ class BanditTestSet:
 
         # this dresses up the blacklist to look like a plugin, but
         # the '_checks' data comes from the blacklist information.
-        # the '_config' is the filtered blacklist data set.
+        # the '_config' is the filtered blacklist data set, and '_tables' the
+        # lookup tables built from it.
         blacklisting.blacklist._test_id = "B001"
         blacklisting.blacklist._checks = blacklist.keys()
+        blacklisting.blacklist._tables = blacklisting.build_lookup_tables(
+            blacklist
+        )
         blacklisting.blacklist._config = blacklist
 
         return [Wrapper("blacklist", blacklisting.blacklist)]
@@ -22,6 +22,10 @@ class BanditTester:
         self.debug = debug
         self.nosec_lines = nosec_lines
         self.metrics = metrics
+        # modules required by tests, seen so far in the current file
+        self.found_modules = set()
+        # modules required by tests, mapped to the import count last checked
+        self.missing_modules = {}
 
     def run_tests(self, raw_context, checktype):
         """Runs all tests for a certain type of check, for example
@@ -47,7 +51,11 @@ class BanditTester:
             temp_context = copy.copy(raw_context)
             context = b_context.Context(temp_context)
             try:
-                if hasattr(test, "_config"):
+                # a test skipped for lack of its required module is treated
+                # as having found nothing, so stale nosec comments still warn
+                if not self._has_required_module(test, raw_context):
+                    result = None
+                elif hasattr(test, "_config"):
                     result = test(context, test._config)
                 else:
                     result = test(context)
@@ -121,6 +129,30 @@ class BanditTester:
         LOG.debug("Returning scores: %s", scores)
         return scores
 
+    def _has_required_module(self, test, raw_context):
+        """Check that the module a test requires has been imported.
+
+        Imports only accumulate while a file is visited, so a module found
+        once is remembered, and a missing module is only looked for again
+        after further imports have been seen.
+
+        :param test: The test to check
+        :param raw_context: Raw context dictionary
+        :return: True if the test should be run, False otherwise
+        """
+        module = getattr(test, "_requires_module", None)
+        if module is None or module in self.found_modules:
+            return True
+
+        imports = raw_context.get("imports", ())
+        if self.missing_modules.get(module) == len(imports):
+            return False
+        if any(module in imp for imp in imports):
+            self.found_modules.add(module)
+            return True
+        self.missing_modules[module] = len(imports)
+        return False
+
     def _get_nosecs_from_contexts(self, context, test_result=None):
         """Use context and optional test result to get set of tests to skip.
         :param context: temp context
@@ -51,13 +51,16 @@ import bandit
 from bandit.core import issue
 from bandit.core import test_properties as test
 
+HTTP_VERBS = frozenset(
+    ("get", "options", "head", "post", "put", "patch", "delete")
+)
+HTTPX_ATTRS = HTTP_VERBS | {"request", "stream", "Client", "AsyncClient"}
+
 
 @test.checks("Call")
 @test.test_id("B113")
 def request_without_timeout(context):
-    HTTP_VERBS = {"get", "options", "head", "post", "put", "patch", "delete"}
-    HTTPX_ATTRS = {"request", "stream", "Client", "AsyncClient"} | HTTP_VERBS
-    qualname = context.call_function_name_qual.split(".")[0]
+    qualname = context.call_function_name_qual.partition(".")[0]
 
     if qualname == "requests" and context.call_function_name in HTTP_VERBS:
         # check for missing timeout
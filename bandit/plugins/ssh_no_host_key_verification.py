@@ -41,13 +41,15 @@ import bandit
 from bandit.core import issue
 from bandit.core import test_properties as test
 
+TRUSTING_POLICIES = frozenset(("AutoAddPolicy", "WarningPolicy"))
+
 
 @test.checks("Call")
 @test.test_id("B507")
+@test.requires_module("paramiko")
 def ssh_no_host_key_verification(context):
     if (
-        context.is_module_imported_like("paramiko")
-        and context.call_function_name == "set_missing_host_key_policy"
+        context.call_function_name == "set_missing_host_key_policy"
         and context.node.args
     ):
         policy_argument = context.node.args[0]
@@ -63,7 +65,7 @@ def ssh_no_host_key_verification(context):
             elif isinstance(policy_argument.func, ast.Name):
                 policy_argument_value = policy_argument.func.id
 
-        if policy_argument_value in ["AutoAddPolicy", "WarningPolicy"]:
+        if policy_argument_value in TRUSTING_POLICIES:
             return bandit.Issue(
                 severity=bandit.HIGH,
                 confidence=bandit.MEDIUM,
@@ -9,6 +9,7 @@ import fixtures
 import testtools
 
 from bandit.cli import main as bandit
+from bandit.core import blacklisting
 from bandit.core import extension_loader as ext_loader
 from bandit.core import utils
 
@@ -73,6 +74,14 @@ class BanditCLIMainLoggerTests(testtools.TestCase):
         bandit._init_logger(logging.DEBUG)
         self.assertEqual(logging.DEBUG, self.logger.level)
 
+    @mock.patch("bandit.cli.main._WARNINGS_CAPTURED", False)
+    def test_init_logger_captures_warnings_once(self):
+        # Test that warnings are only routed through logging once
+        with mock.patch("logging.captureWarnings") as mock_capture:
+            bandit._init_logger()
+            bandit._init_logger(logging.WARN)
+        mock_capture.assert_called_once_with(True)
+
 
 class BanditCLIMainTests(testtools.TestCase):
     def setUp(self):
@@ -124,6 +133,52 @@ class BanditCLIMainTests(testtools.TestCase):
             [target_directory],
         )
 
+    def test_get_options_from_ini_multi_targets_stops_early(self):
+        # Test that bandit stops searching further targets once a second
+        # bandit config file (.bandit) has been found
+        targets = [self.useFixture(fixtures.TempDir()).path for _ in range(3)]
+        for target in targets:
+            with open(os.path.join(target, ".bandit"), "w") as fd:
+                fd.write(bandit_config_content)
+        with mock.patch(
+            "bandit.cli.main._find_bandit_files",
+            side_effect=bandit._find_bandit_files,
+        ) as mock_find:
+            self.assertRaisesRegex(
+                SystemExit,
+                "2",
+                bandit._get_options_from_ini,
+                None,
+                targets,
+            )
+        self.assertEqual(2, mock_find.call_count)
+
+    def test_get_options_from_ini_no_ini_path_nested_bandit_file(self):
+        # Test that a single bandit config file (.bandit) is found in a
+        # subdirectory of the target directory when no ini path is provided
+        target_directory = self.useFixture(fixtures.TempDir()).path
+        sub_directory = os.path.join(target_directory, "sub", "dir")
+        os.makedirs(sub_directory)
+        with open(os.path.join(sub_directory, ".bandit"), "w") as fd:
+            fd.write("[bandit]\nskips: B101\n")
+        self.assertEqual(
+            {"skips": "B101"},
+            bandit._get_options_from_ini(None, [target_directory]),
+        )
+
+    def test_get_options_from_ini_ignores_symlinked_bandit_directory(self):
+        # Test that a symlink to a directory named .bandit is not taken for
+        # a bandit config file
+        target_directory = self.useFixture(fixtures.TempDir()).path
+        os.mkdir(os.path.join(target_directory, "real"))
+        os.symlink(
+            os.path.join(target_directory, "real"),
+            os.path.join(target_directory, ".bandit"),
+        )
+        self.assertIsNone(
+            bandit._get_options_from_ini(None, [target_directory])
+        )
+
     def test_init_extensions(self):
         # Test that an extension loader manager is returned
         self.assertEqual(ext_loader.MANAGER, bandit._init_extensions())
@@ -175,6 +230,25 @@ class BanditCLIMainTests(testtools.TestCase):
             bandit._log_option_source(None, None, None, option_name)
         )
 
+    def test_lazy_epilog_parser(self):
+        # Test that the epilog is only built when help is formatted
+        epilog_func = mock.Mock(return_value="loaded tests")
+        parser = bandit._LazyEpilogParser(epilog_func=epilog_func)
+        parser.parse_args([])
+        epilog_func.assert_not_called()
+        self.assertIn("loaded tests", parser.format_help())
+        parser.format_help()
+        epilog_func.assert_called_once_with()
+
+    def test_build_parser_cached(self):
+        # Test that the argument parser is only built once per extension
+        # manager
+        extension_mgr = bandit._init_extensions()
+        self.assertIs(
+            bandit._build_parser(extension_mgr),
+            bandit._build_parser(extension_mgr),
+        )
+
     @mock.patch("sys.argv", ["bandit", "-c", "bandit.yaml", "test"])
     def test_main_config_unopenable(self):
         # Test that bandit exits when a config file cannot be opened
@@ -218,6 +292,24 @@ class BanditCLIMainTests(testtools.TestCase):
                     "Unknown test found in profile: some_test",
                 )
 
+    @mock.patch("sys.argv", ["bandit", "-c", "bandit.yaml", "-q", "test"])
+    def test_main_quiet_with_log_format(self):
+        # Test that the logger is only reinitialized once, for quiet mode,
+        # when a log format string is also set in the config file
+        temp_directory = self.useFixture(fixtures.TempDir()).path
+        os.chdir(temp_directory)
+        with open("bandit.yaml", "w") as fd:
+            fd.write(bandit_config_content + "log_format: '%(message)s'\n")
+        with mock.patch("bandit.cli.main._init_logger") as mock_init_logger:
+            self.assertRaises(SystemExit, bandit.main)
+        self.assertEqual(
+            [
+                mock.call(logging.INFO),
+                mock.call(log_level=logging.WARN),
+            ],
+            mock_init_logger.call_args_list,
+        )
+
     @mock.patch(
         "sys.argv", ["bandit", "-c", "bandit.yaml", "-t", "badID", "test"]
     )
@@ -334,6 +426,31 @@ class BanditCLIMainTests(testtools.TestCase):
             # assert a SystemExit with code 0
             self.assertRaisesRegex(SystemExit, "0", bandit.main)
 
+    @mock.patch(
+        "sys.argv", ["bandit", "-c", "bandit.yaml", "test", "-o", "output"]
+    )
+    def test_main_repeated_runs(self):
+        # Test that running bandit again in-process reuses the parser and
+        # replaces, rather than accumulates, the blacklist lookup tables
+        temp_directory = self.useFixture(fixtures.TempDir()).path
+        os.chdir(temp_directory)
+        with open("bandit.yaml", "w") as fd:
+            fd.write(bandit_config_content)
+        with mock.patch(
+            "bandit.core.manager.BanditManager.results_count"
+        ) as mock_mgr_results_ct:
+            mock_mgr_results_ct.return_value = 0
+            self.assertRaisesRegex(SystemExit, "0", bandit.main)
+            first_tables = blacklisting.blacklist._tables
+            self.assertRaisesRegex(SystemExit, "0", bandit.main)
+
+        self.assertEqual(1, bandit._build_parser.cache_info().currsize)
+        self.assertIsNot(first_tables, blacklisting.blacklist._tables)
+        self.assertIs(
+            blacklisting.blacklist._tables,
+            blacklisting._get_lookup_tables(blacklisting.blacklist._config),
+        )
+
     @mock.patch(
         "sys.argv",
         ["bandit", "-c", "bandit.yaml", "test", "-o", "output", "--exit-zero"],
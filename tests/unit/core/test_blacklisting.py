@@ -2,6 +2,9 @@
 # Copyright 2016 Hewlett-Packard Development Company, L.P.
 #
 # SPDX-License-Identifier: Apache-2.0
+import ast
+from unittest import mock
+
 import testtools
 
 from bandit.core import blacklisting
@@ -31,3 +34,49 @@ class BlacklistingTests(testtools.TestCase):
         self.assertEqual({}, issue_dict["issue_cwe"])
         self.assertEqual("HIGH", issue_dict["issue_confidence"])
         self.assertEqual("test name", issue_dict["issue_text"])
+
+    def _import_context(self, source):
+        return mock.Mock(node=ast.parse(source).body[0])
+
+    def test_blacklist_call(self):
+        config = {
+            "Call": [
+                {"id": "B000", "message": "{name}", "qualnames": ["a.b"]},
+                {"id": "B001", "message": "{name}", "qualnames": ["a.b"]},
+            ]
+        }
+        context = mock.Mock(
+            node=ast.parse("a.b()").body[0].value,
+            call_function_name_qual="a.b",
+        )
+        result = blacklisting.blacklist(context, config)
+        self.assertEqual("B000", result.test_id)
+
+        context.call_function_name_qual = "a.c"
+        self.assertIsNone(blacklisting.blacklist(context, config))
+
+    def test_blacklist_import_first_check_wins(self):
+        config = {
+            "Import": [
+                {"id": "B000", "message": "{name}", "qualnames": ["b"]},
+                {"id": "B001", "message": "{name}", "qualnames": ["a"]},
+            ]
+        }
+        context = self._import_context("import a.x, b.y")
+        result = blacklisting.blacklist(context, config)
+        self.assertEqual("B000", result.test_id)
+        self.assertEqual("b.y", result.text)
+
+    def test_blacklist_import_from_prefix(self):
+        config = {
+            "ImportFrom": [
+                {"id": "B000", "message": "{name}", "qualnames": ["a.b"]},
+            ]
+        }
+        context = self._import_context("from a import c, bx")
+        result = blacklisting.blacklist(context, config)
+        self.assertEqual("B000", result.test_id)
+        self.assertEqual("bx", result.text)
+
+        context = self._import_context("from b import a")
+        self.assertIsNone(blacklisting.blacklist(context, config))
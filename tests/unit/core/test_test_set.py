@@ -8,6 +8,7 @@ import testtools
 from stevedore import extension
 
 from bandit.blacklists import utils
+from bandit.core import blacklisting
 from bandit.core import extension_loader
 from bandit.core import issue
 from bandit.core import test_properties as test
@@ -117,6 +118,21 @@ class BanditTestSetTests(testtools.TestCase):
         self.assertEqual(2, len(blacklist._config["ImportFrom"]))
         self.assertEqual(2, len(blacklist._config["Call"]))
 
+    def test_profile_blacklist_lookup_tables(self):
+        ts = test_set.BanditTestSet(self.config)
+        blacklist = ts.get_tests("Import")[0]
+
+        self.assertEqual(set(blacklist._config), set(blacklist._tables))
+        self.assertIs(
+            blacklist._tables,
+            blacklisting._get_lookup_tables(blacklist._config),
+        )
+
+        # a new test set replaces the tables rather than adding to them
+        old_tables = blacklist._tables
+        test_set.BanditTestSet(self.config)
+        self.assertIsNot(old_tables, blacklist._tables)
+
     def test_profile_filter_blacklist_one(self):
         profile = {"exclude": ["B401"]}
         ts = test_set.BanditTestSet(self.config, profile)
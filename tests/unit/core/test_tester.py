@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: Apache-2.0
+from unittest import mock
+
+import testtools
+
+from bandit.core import test_properties as test
+from bandit.core import tester
+
+
+@test.checks("Call")
+@test.test_id("B000")
+@test.requires_module("paramiko")
+def requires_paramiko(context):
+    return None
+
+
+class BanditTesterTests(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tester = tester.BanditTester(
+            mock.Mock(), False, {}, mock.Mock()
+        )
+
+    def test_has_required_module_no_requirement(self):
+        self.assertTrue(
+            self.tester._has_required_module(mock.Mock(spec=[]), {})
+        )
+
+    def test_has_required_module_not_imported(self):
+        imports = {"os"}
+        self.assertFalse(
+            self.tester._has_required_module(
+                requires_paramiko, {"imports": imports}
+            )
+        )
+        imports.add("paramiko.client")
+        self.assertTrue(
+            self.tester._has_required_module(
+                requires_paramiko, {"imports": imports}
+            )
+        )
+        # once found the module is remembered for the rest of the file
+        self.assertTrue(
+            self.tester._has_required_module(requires_paramiko, {})
+        )
+
+    def _raw_context(self, imports):
+        return {
+            "imports": imports,
+            "filename": "test.py",
+            "lineno": 2,
+            "linerange": [2],
+        }
+
+    def test_run_tests_skips_test_without_required_module(self):
+        plugin = mock.Mock(
+            __name__="plugin", _requires_module="paramiko", _test_id="B000"
+        )
+        self.tester.testset.get_tests.return_value = [plugin]
+        self.tester.run_tests(self._raw_context({"os"}), "Call")
+        plugin.assert_not_called()
+
+    def test_run_tests_skipped_test_warns_on_stale_nosec(self):
+        self.tester.nosec_lines = {2: {"B000"}}
+        self.tester.testset.get_tests.return_value = [requires_paramiko]
+        with mock.patch("bandit.core.tester.LOG.warning") as warn_mock:
+            self.tester.run_tests(self._raw_context({"os"}), "Call")
+        warn_mock.assert_called_once_with(
+            "nosec encountered (B000), but no failed test on line 2"
+        )